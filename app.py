@@ -7,9 +7,9 @@ import os
 import sys
 import tempfile
 import streamlit as st
-import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 sys.path.insert(0, os.path.dirname(__file__))
@@ -34,135 +34,25 @@ st.set_page_config(
 )
 
 # ── Custom CSS ────────────────────────────────────────────────────────────────
-st.markdown("""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-    html, body, [class*="css"] { font-family: 'Inter', sans-serif; }
-
-    .stApp { background: linear-gradient(135deg, #0f0c29 0%, #302b63 50%, #24243e 100%); }
-
-    [data-testid="stSidebar"] {
-        background: rgba(255,255,255,0.04);
-        border-right: 1px solid rgba(255,255,255,0.08);
-    }
-    [data-testid="stSidebar"] * { color: #e0e0e0 !important; }
-
-    .header-bar {
-        background: linear-gradient(90deg, rgba(99,102,241,0.3), rgba(139,92,246,0.3));
-        border: 1px solid rgba(139,92,246,0.4);
-        border-radius: 14px; padding: 18px 28px; margin-bottom: 20px;
-        display: flex; align-items: center; gap: 14px;
-    }
-    .header-title { font-size: 1.6rem; font-weight: 700; color: #fff; margin: 0; }
-    .header-sub   { font-size: 0.85rem; color: #a5b4fc; margin: 0; }
-
-    .panel-card {
-        background: rgba(255,255,255,0.04);
-        border: 1px solid rgba(255,255,255,0.1);
-        border-radius: 14px; padding: 20px; min-height: 520px;
-    }
-    .panel-title {
-        font-size: 0.85rem; font-weight: 600; color: #a5b4fc;
-        text-transform: uppercase; letter-spacing: 0.08em; margin-bottom: 14px;
-    }
-
-    .msg-user {
-        background: rgba(99,102,241,0.25); border: 1px solid rgba(99,102,241,0.4);
-        border-radius: 12px 12px 2px 12px; padding: 12px 16px; margin: 8px 0;
-        color: #e0e0e0; font-size: 0.92rem;
-    }
-    .msg-ai {
-        background: rgba(139,92,246,0.15); border: 1px solid rgba(139,92,246,0.3);
-        border-radius: 12px 12px 12px 2px; padding: 12px 16px; margin: 8px 0;
-        color: #e0e0e0; font-size: 0.92rem; line-height: 1.6;
-    }
-    .msg-label {
-        font-size: 0.72rem; font-weight: 600; color: #a5b4fc; margin-bottom: 4px;
-        text-transform: uppercase; letter-spacing: 0.06em;
-    }
-
-    .kpi-card {
-        flex: 1; background: rgba(99,102,241,0.15); border: 1px solid rgba(99,102,241,0.3);
-        border-radius: 10px; padding: 12px 14px; text-align: center;
-    }
-    .kpi-value { font-size: 1.3rem; font-weight: 700; color: #a5b4fc; }
-    .kpi-label { font-size: 0.72rem; color: #9ca3af; margin-top: 2px; }
-
-    .source-card {
-        background: rgba(255,255,255,0.04); border: 1px solid rgba(255,255,255,0.1);
-        border-radius: 10px; padding: 10px 14px; margin-bottom: 6px;
-    }
-    .source-card.active {
-        background: rgba(99,102,241,0.2); border-color: rgba(99,102,241,0.5);
-    }
-
-    .demo-badge {
-        background: linear-gradient(90deg, #f59e0b, #ef4444);
-        color: white; font-size: 0.72rem; font-weight: 700;
-        padding: 3px 10px; border-radius: 20px; letter-spacing: 0.08em;
-    }
-    .model-badge {
-        background: rgba(139,92,246,0.25); border: 1px solid rgba(139,92,246,0.4);
-        color: #c4b5fd; font-size: 0.72rem; font-weight: 600;
-        padding: 3px 10px; border-radius: 20px;
-    }
-    .source-badge {
-        background: rgba(99,102,241,0.2); border: 1px solid rgba(99,102,241,0.4);
-        color: #818cf8; font-size: 0.72rem; font-weight: 600;
-        padding: 3px 10px; border-radius: 20px;
-    }
-    .email-success {
-        background: rgba(34,197,94,0.15); border: 1px solid rgba(34,197,94,0.3);
-        color: #86efac; padding: 10px 14px; border-radius: 10px;
-        font-size: 0.85rem; margin: 8px 0;
-    }
-    .email-error {
-        background: rgba(239,68,68,0.15); border: 1px solid rgba(239,68,68,0.3);
-        color: #fca5a5; padding: 10px 14px; border-radius: 10px;
-        font-size: 0.85rem; margin: 8px 0;
-    }
-
-    .stButton > button {
-        background: linear-gradient(135deg, #6366f1, #8b5cf6);
-        color: white; border: none; border-radius: 10px; font-weight: 600;
-        transition: all 0.2s ease;
-    }
-    .stButton > button:hover {
-        transform: translateY(-1px); box-shadow: 0 4px 20px rgba(99,102,241,0.5);
-    }
-    .stTextInput > div > div > input {
-        background: #111111 !important;
-        border: 1px solid rgba(255,255,255,0.25) !important;
-        border-radius: 10px !important; color: #ffffff !important;
-    }
-    .stTextInput > div > div > input::placeholder {
-        color: #9ca3af !important;
-    }
-    .stSelectbox > div > div {
-        background: rgba(255,255,255,0.06) !important;
-        border: 1px solid rgba(255,255,255,0.15) !important;
-        border-radius: 10px !important;
-    }
-    .chat-scroll { max-height: 380px; overflow-y: auto; padding-right: 4px; }
-    #MainMenu, footer { visibility: hidden; }
-    header[data-testid="stHeader"] {
-        background: #000000 !important;
-        color: #ffffff !important;
-    }
-    header[data-testid="stHeader"] * {
-        color: #ffffff !important;
-    }
-</style>
-""", unsafe_allow_html=True)
+@st.cache_data(show_spinner=False)
+def _load_css() -> str:
+    """Read the stylesheet once per session instead of re-parsing the blob inline."""
+    with open(os.path.join(os.path.dirname(__file__), "styles.css")) as f:
+        return f.read()
+
+
+st.markdown(f"<style>{_load_css()}</style>", unsafe_allow_html=True)
 
 
 # ── Session state ─────────────────────────────────────────────────────────────
 for key, default in {
     "messages": [],
+    "msg_html": [],
+    "last_user_question": "",
     "last_df": None,
+    "last_df_numeric_cols": None,
     "last_result": None,
     "selected_followup": None,
-    "pending_followup": None,
     "email_status": None,
 }.items():
     if key not in st.session_state:
@@ -171,62 +61,190 @@ for key, default in {
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
-def build_chart(df, chart_type, x_col, y_col):
+# Chart styling is data-independent — build it once at import, not per call.
+_CHART_COLORS = ("#6366f1", "#8b5cf6", "#a78bfa", "#c4b5fd", "#818cf8", "#e879f9")
+_CHART_LAYOUT = dict(
+    paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
+    font=dict(family="Inter", color="#e0e0e0", size=12),
+    margin=dict(l=30, r=20, t=40, b=30),
+    xaxis=dict(gridcolor="rgba(255,255,255,0.05)", tickfont=dict(color="#9ca3af")),
+    yaxis=dict(gridcolor="rgba(255,255,255,0.08)", tickfont=dict(color="#9ca3af")),
+)
+
+
+def _downsample_for_chart(df, chart_type, x_col, y_col):
+    """Cap the number of marks handed to Plotly — pies collapse past ~200
+    slices and SVG bar/line rendering degrades past a few thousand points."""
+    numeric_y = pd.api.types.is_numeric_dtype(df[y_col])
+    if chart_type == "pie" and len(df) > 50 and numeric_y:
+        top = df.nlargest(50, y_col)
+        other = df[y_col].sum() - top[y_col].sum()
+        return pd.concat(
+            [top, pd.DataFrame({x_col: ["Other"], y_col: [other]})],
+            ignore_index=True,
+        )
+    if chart_type == "line" and len(df) > 2000:
+        return df.iloc[:: len(df) // 2000]
+    if chart_type == "bar" and len(df) > 30 and numeric_y:
+        return df.nlargest(30, y_col)
+    return df
+
+
+def build_chart(df, chart_type, x_col, y_col, numeric_cols=None):
     if df is None or df.empty:
         return None
-    cols = df.columns.tolist()
+    cols = df.columns
     if x_col not in cols:
         x_col = cols[0]
     if y_col not in cols or y_col == x_col:
-        nc = df.select_dtypes("number").columns.tolist()
-        y_col = nc[0] if nc else cols[-1]
-
-    COLORS = ["#6366f1", "#8b5cf6", "#a78bfa", "#c4b5fd", "#818cf8", "#e879f9"]
-    layout = dict(
-        paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
-        font=dict(family="Inter", color="#e0e0e0", size=12),
-        margin=dict(l=30, r=20, t=40, b=30),
-        xaxis=dict(gridcolor="rgba(255,255,255,0.05)", tickfont=dict(color="#9ca3af")),
-        yaxis=dict(gridcolor="rgba(255,255,255,0.08)", tickfont=dict(color="#9ca3af")),
-    )
+        nc = numeric_cols if numeric_cols is not None else df.select_dtypes("number").columns
+        y_col = nc[0] if len(nc) else cols[-1]
+
+    df = _downsample_for_chart(df, chart_type, x_col, y_col)
+
+    # Hand Plotly raw numpy arrays via graph_objects — skips the Plotly
+    # Express inference layer and its per-element Python boxing.
+    x = df[x_col].to_numpy()
+    y = df[y_col].to_numpy()
     if chart_type == "pie":
-        fig = px.pie(df, names=x_col, values=y_col, color_discrete_sequence=COLORS, hole=0.35)
-        fig.update_traces(textfont_color="#e0e0e0")
+        fig = go.Figure(go.Pie(
+            labels=x, values=y, hole=0.35,
+            marker=dict(colors=_CHART_COLORS), textfont=dict(color="#e0e0e0"),
+        ))
     elif chart_type == "line":
-        fig = px.line(df, x=x_col, y=y_col, markers=True, color_discrete_sequence=COLORS)
-        fig.update_traces(line=dict(width=3))
+        # Scattergl keeps the WebGL renderer for large series.
+        fig = go.Figure(go.Scattergl(
+            x=x, y=y, mode="lines+markers",
+            line=dict(color=_CHART_COLORS[0], width=3),
+        ))
     else:
-        fig = px.bar(df, x=x_col, y=y_col, color_discrete_sequence=COLORS, text_auto=True)
-        fig.update_traces(textfont_size=11, textposition="outside", marker=dict(line=dict(width=0)))
-    fig.update_layout(**layout)
+        fig = go.Figure(go.Bar(
+            x=x, y=y, text=y, textposition="outside",
+            textfont=dict(size=11), marker=dict(color=_CHART_COLORS[0], line=dict(width=0)),
+        ))
+    fig.update_layout(**_CHART_LAYOUT)
     return fig
 
 
-def compute_kpis(df):
-    kpis = [{"label": "Records", "value": f"{len(df):,}"}]
-    for col in df.select_dtypes("number").columns[:2]:
-        kpis.append({"label": col.replace("_", " ").title(), "value": f"{df[col].sum():,.0f}"})
+def compute_kpis(df, numeric_cols=None):
+    # One C-level reduction over the numeric block instead of per-column sums.
+    if numeric_cols is None:
+        numeric_cols = df.select_dtypes("number").columns
+    sums = df[numeric_cols[:2]].sum()
+    kpis = [{"label": "Records", "value": f"{len(df):,}"}] + [
+        {"label": col.replace("_", " ").title(), "value": f"{total:,.0f}"}
+        for col, total in sums.items()
+    ]
     return kpis[:3]
 
 
+def _df_fingerprint(df):
+    """Cheap content key for a DataFrame — shape plus a C-level row hash sum."""
+    return (df.shape, int(pd.util.hash_pandas_object(df, index=False).sum()))
+
+
+@st.cache_data(show_spinner=False)
+def _cached_csv(df_key, _df):
+    # The leading-underscore arg is excluded from Streamlit's hashing;
+    # df_key carries the identity so the frame itself is never rehashed.
+    return _df.to_csv(index=False)
+
+
+@st.cache_data(show_spinner=False)
+def _cached_report(df_key, _df, question, explanation, sql, source_name,
+                   chart_type, model_name, x_col, y_col):
+    return generate_html_report(
+        question=question, explanation=explanation, sql=sql, df=_df,
+        source_name=source_name, chart_type=chart_type,
+        model_name=model_name, x_col=x_col, y_col=y_col,
+    )
+
+
+class _CacheBypass(Exception):
+    """Raised inside the cached helpers so st.cache_data never stores a
+    failed result — a transient Vertex/BigQuery error would otherwise be
+    replayed for the full TTL. Carries the payload for the caller."""
+    def __init__(self, payload):
+        self.payload = payload
+
+
+def _unwrap(fn, *args):
+    """Call a cached helper, recovering failures that bypassed the cache."""
+    try:
+        return fn(*args)
+    except _CacheBypass as bypass:
+        return bypass.payload
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_run_agent(question, model_id, src_id, is_local, _on_sql=None):
+    result = run_agent(question, model_id, src_id, is_local=is_local, on_sql=_on_sql)
+    if result.get("error"):
+        raise _CacheBypass(result)
+    return result
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_execute_sql(sql, src_id, question, is_local):
+    df, err = execute_sql(sql, src_id, question, is_local=is_local)
+    if err is not None:
+        raise _CacheBypass((df, err))
+    return df, err
+
+
 def run_query(question, model_id, source):
     local = is_local_source(source)
     src_id = source["id"]
     mode_label = "LOCAL" if local else get_model_by_id(model_id)["label"]
     with st.spinner(f"🤖 Thinking with **{mode_label}**..."):
-        result = run_agent(question, model_id, src_id, is_local=local)
-        df, err = execute_sql(result.get("sql", ""), src_id, question, is_local=local)
+        if local:
+            result = _unwrap(_cached_run_agent, question, model_id, src_id, local)
+            df, err = _unwrap(_cached_execute_sql, result.get("sql", ""), src_id, question, local)
+        else:
+            # Overlap BigQuery execution with the tail of the Vertex stream:
+            # the agent fires _launch_sql as soon as the sql field closes,
+            # so the query runs while the explanation is still generating.
+            with ThreadPoolExecutor(max_workers=1) as ex:
+                early = {}
+
+                def _launch_sql(sql):
+                    early["sql"] = sql
+                    early["future"] = ex.submit(execute_sql, sql, src_id, question, False)
+
+                result = _unwrap(_cached_run_agent, question, model_id, src_id, local, _launch_sql)
+                sql = result.get("sql", "")
+                if early.get("sql") == sql:
+                    df, err = early["future"].result()
+                else:
+                    # Cache hit (no stream) or early parse mismatch.
+                    df, err = _unwrap(_cached_execute_sql, sql, src_id, question, local)
 
     st.session_state.messages.append({"role": "user", "content": question})
+    st.session_state.last_user_question = question
     st.session_state.messages.append({
         "role": "ai", "content": result.get("explanation", ""),
         "model": "Local Demo" if local else get_model_by_id(model_id)["label"],
     })
     st.session_state.last_result = result
     st.session_state.last_df = df if err is None else None
+    # One dtype scan per new result — chart and KPI code reuse this.
+    st.session_state.last_df_numeric_cols = (
+        df.select_dtypes("number").columns if err is None and df is not None else None
+    )
     if err:
         st.session_state.messages[-1]["content"] += f"\n\n⚠️ Query error: {err}"
 
+    # Format only the two new messages — the chat pane joins the cached
+    # per-message HTML instead of rebuilding the whole transcript each rerun.
+    ai_msg = st.session_state.messages[-1]
+    badge = f"<span class='model-badge'>{ai_msg.get('model', 'AI')}</span>"
+    st.session_state.msg_html.append(f"""
+                <div class='msg-label'>You</div>
+                <div class='msg-user'>{question}</div>""")
+    st.session_state.msg_html.append(f"""
+                <div class='msg-label'>AI Agent &nbsp;{badge}</div>
+                <div class='msg-ai'>{ai_msg['content']}</div>""")
+
 
 # ── Sidebar ───────────────────────────────────────────────────────────────────
 with st.sidebar:
@@ -277,11 +295,7 @@ with st.sidebar:
     if st.button("📤 Email Current Report", use_container_width=True):
         if st.session_state.last_result and email_to.strip():
             r = st.session_state.last_result
-            last_q = ""
-            for m in reversed(st.session_state.messages):
-                if m["role"] == "user":
-                    last_q = m["content"]
-                    break
+            last_q = st.session_state.last_user_question
             success, msg = send_report_email(
                 to_emails=[e.strip() for e in email_to.split(",")],
                 subject=f"BI Report: {source['label']} — {last_q[:50]}",
@@ -307,6 +321,7 @@ with st.sidebar:
     # ── Clear ──
     if st.button("🗑️ Clear Conversation", use_container_width=True):
         st.session_state.messages = []
+        st.session_state.msg_html = []
         st.session_state.last_df = None
         st.session_state.last_result = None
         st.rerun()
@@ -348,12 +363,15 @@ st.markdown(f"""
 col_chat, col_viz = st.columns([1, 1.1], gap="large")
 
 # ── LEFT: Chat ────────────────────────────────────────────────────────────────
-with col_chat:
+# Fragments localize reruns: interacting with one panel re-renders only that
+# panel instead of the whole script. run_query mutates shared session state,
+# so it still triggers a full st.rerun() when called.
+@st.fragment
+def _render_chat():
     st.markdown('<div class="panel-title">💬 Conversation</div>', unsafe_allow_html=True)
 
-    chat_html = '<div class="chat-scroll">'
-    if not st.session_state.messages:
-        chat_html += f"""
+    if not st.session_state.msg_html:
+        body = f"""
         <div style='text-align:center;padding:40px 20px;color:#4b5563;'>
             <div style='font-size:2.5rem;margin-bottom:10px;'>{source['icon']}</div>
             <div style='font-size:0.9rem;color:#6b7280;'>Ask a question about <b>{source['label']}</b> data</div>
@@ -362,28 +380,11 @@ with col_chat:
             </div>
         </div>"""
     else:
-        for msg in st.session_state.messages:
-            if msg["role"] == "user":
-                chat_html += f"""
-                <div class='msg-label'>You</div>
-                <div class='msg-user'>{msg['content']}</div>"""
-            else:
-                badge = f"<span class='model-badge'>{msg.get('model','AI')}</span>"
-                chat_html += f"""
-                <div class='msg-label'>AI Agent &nbsp;{badge}</div>
-                <div class='msg-ai'>{msg['content']}</div>"""
-    chat_html += "</div>"
-    st.markdown(chat_html, unsafe_allow_html=True)
+        body = "".join(st.session_state.msg_html)
+    st.markdown(f'<div class="chat-scroll">{body}</div>', unsafe_allow_html=True)
 
     st.markdown("---")
 
-    # Auto-execute pending follow-up
-    if st.session_state.pending_followup:
-        fu_q = st.session_state.pending_followup
-        st.session_state.pending_followup = None
-        run_query(fu_q, selected_model_id, source)
-        st.rerun()
-
     with st.form(key="query_form", clear_on_submit=True):
         user_input = st.text_input(
             "Your question", value="",
@@ -406,11 +407,13 @@ with col_chat:
 
 
 # ── RIGHT: Visualization ─────────────────────────────────────────────────────
-with col_viz:
+@st.fragment
+def _render_viz():
     st.markdown('<div class="panel-title">📊 Visualization & Reports</div>', unsafe_allow_html=True)
 
     result = st.session_state.last_result
     df = st.session_state.last_df
+    numeric_cols = st.session_state.last_df_numeric_cols
 
     if result is None:
         st.markdown(f"""
@@ -424,7 +427,7 @@ with col_viz:
     else:
         # KPIs
         if df is not None and not df.empty:
-            kpis = compute_kpis(df)
+            kpis = compute_kpis(df, numeric_cols)
             kpi_cols = st.columns(len(kpis))
             for i, kpi in enumerate(kpis):
                 with kpi_cols[i]:
@@ -439,7 +442,7 @@ with col_viz:
         xc = result.get("x_col", "")
         yc = result.get("y_col", "")
         if df is not None and not df.empty:
-            fig = build_chart(df, ct, xc, yc)
+            fig = build_chart(df, ct, xc, yc, numeric_cols)
             if fig:
                 st.plotly_chart(fig, use_container_width=True)
         else:
@@ -453,21 +456,18 @@ with col_viz:
         # ── Download Report ──
         if df is not None and not df.empty:
             st.markdown("---")
-            last_q = ""
-            for m in reversed(st.session_state.messages):
-                if m["role"] == "user":
-                    last_q = m["content"]
-                    break
-            report_html = generate_html_report(
-                question=last_q,
-                explanation=result.get("explanation", ""),
-                sql=result.get("sql", ""),
-                df=df,
-                source_name=f"{source['icon']} {source['label']}",
-                chart_type=ct,
-                model_name=selected_model["label"],
-                x_col=xc,
-                y_col=yc,
+            last_q = st.session_state.last_user_question
+            df_key = _df_fingerprint(df)
+            report_html = _cached_report(
+                df_key, df,
+                last_q,
+                result.get("explanation", ""),
+                result.get("sql", ""),
+                f"{source['icon']} {source['label']}",
+                ct,
+                selected_model["label"],
+                xc,
+                yc,
             )
             dl_col1, dl_col2 = st.columns(2)
             with dl_col1:
@@ -479,7 +479,7 @@ with col_viz:
                     use_container_width=True,
                 )
             with dl_col2:
-                csv_data = df.to_csv(index=False)
+                csv_data = _cached_csv(df_key, df)
                 st.download_button(
                     "📥 Download Data (CSV)",
                     data=csv_data,
@@ -495,8 +495,13 @@ with col_viz:
             st.markdown('<div class="panel-title">💡 Suggested Follow-ups</div>', unsafe_allow_html=True)
             for fu in followups:
                 if st.button(f"→ {fu}", key=f"fu_{fu[:30]}", use_container_width=True):
-                    st.session_state.pending_followup = fu
+                    # Run inline and rerun once to render the new state —
+                    # the old pending_followup hand-off cost two full reruns.
+                    run_query(fu, selected_model_id, source)
                     st.rerun()
 
 
-
+with col_chat:
+    _render_chat()
+with col_viz:
+    _render_viz()
@@ -4,15 +4,33 @@ Local sources return mock responses. Live sources call Vertex AI.
 """
 
 import os
-import json
 import re
-from dotenv import load_dotenv
+import json
+import functools
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from backend.bq_client import get_schema_description
 
-load_dotenv()
+# app.py calls load_dotenv() before importing backend modules, so env vars
+# are read lazily here rather than re-parsing .env at import time.
 
-GCP_PROJECT_ID = os.getenv("GCP_PROJECT_ID", "")
-GCP_LOCATION = os.getenv("GCP_LOCATION", "us-central1")
+# Matches a completed "sql" field inside a partially streamed JSON response.
+_SQL_FIELD_RE = re.compile(r'"sql"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+# Gemini structured-output schema — the model emits validated JSON directly,
+# so no fence stripping or format instructions in the prompt are needed.
+RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "sql": {"type": "string"},
+        "explanation": {"type": "string"},
+        "chart_type": {"type": "string", "enum": ["bar", "line", "pie"]},
+        "x_col": {"type": "string"},
+        "y_col": {"type": "string"},
+        "followups": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["sql", "explanation", "chart_type", "x_col", "y_col", "followups"],
+}
 
 
 # ── Local demo responses per source ──────────────────────────────────────────
@@ -92,6 +110,13 @@ LOCAL_RESPONSES = {
     },
 }
 
+# Freeze the templates (tuple followups + read-only mapping) so a caller
+# mutating its response can never corrupt the shared demo data.
+LOCAL_RESPONSES = {
+    k: MappingProxyType({**v, "followups": tuple(v["followups"])})
+    for k, v in LOCAL_RESPONSES.items()
+}
+
 
 # ── Public API ────────────────────────────────────────────────────────────────
 
@@ -108,16 +133,6 @@ Your task:
 4. Pick x and y columns for the chart
 5. Write a clear 2-3 sentence business explanation
 6. Suggest 3 relevant follow-up questions
-
-Respond ONLY in this JSON format (no markdown, no extra text):
-{{
-  "sql": "<SQL>",
-  "explanation": "<explanation>",
-  "chart_type": "<bar|line|pie>",
-  "x_col": "<column>",
-  "y_col": "<column>",
-  "followups": ["<q1>", "<q2>", "<q3>"]
-}}
 """
 
 SOURCE_NAMES = {
@@ -131,7 +146,7 @@ SOURCE_NAMES = {
 
 
 def run_agent(question: str, model_id: str, source_id: str,
-              is_local: bool = False) -> dict:
+              is_local: bool = False, on_sql=None) -> dict:
     """
     Run the agent pipeline.
     Args:
@@ -139,43 +154,109 @@ def run_agent(question: str, model_id: str, source_id: str,
         model_id:  Vertex AI model ID
         source_id: Source system ID (may include "local_" prefix)
         is_local:  If True, return mock response instead of calling Vertex AI
+        on_sql:    Optional callback fired with the SQL string as soon as it
+                   is parsed from the response stream (before generation ends)
     Returns:
         dict with: sql, explanation, chart_type, x_col, y_col, followups
     """
     base_id = source_id.replace("local_", "")
 
     if is_local:
-        return LOCAL_RESPONSES.get(base_id, LOCAL_RESPONSES["salesforce"]).copy()
+        # Shallow dict copy of the frozen template — picklable for
+        # st.cache_data, and the template itself stays immutable.
+        return dict(LOCAL_RESPONSES.get(base_id, LOCAL_RESPONSES["salesforce"]))
 
     # ── Live: call Vertex AI ──
-    return _call_vertex_ai(question, model_id, base_id)
+    return _call_vertex_ai(question, model_id, base_id, on_sql=on_sql)
 
 
-def _call_vertex_ai(question: str, model_id: str, base_source_id: str) -> dict:
-    try:
-        import vertexai
-        from vertexai.generative_models import GenerativeModel, GenerationConfig
+@functools.lru_cache(maxsize=None)
+def _get_schema(base_source_id: str) -> str:
+    """Fetch + cache the schema description per source (one lookup per session)."""
+    return get_schema_description(base_source_id)
 
-        vertexai.init(project=GCP_PROJECT_ID, location=GCP_LOCATION)
 
-        schema = get_schema_description(base_source_id)
-        source_name = SOURCE_NAMES.get(base_source_id, base_source_id)
-        system_prompt = SYSTEM_PROMPT_TEMPLATE.format(
-            source_name=source_name,
-            schema=schema,
-        )
+@functools.lru_cache(maxsize=1)
+def _init_vertex() -> None:
+    """Run vertexai.init exactly once per process."""
+    import vertexai
+
+    vertexai.init(
+        project=os.getenv("GCP_PROJECT_ID", ""),
+        location=os.getenv("GCP_LOCATION", "us-central1"),
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _get_model(model_id: str, base_source_id: str):
+    """Build + cache a GenerativeModel per (model, source) pair.
 
-        model = GenerativeModel(model_name=model_id, system_instruction=system_prompt)
-        config = GenerationConfig(temperature=0.1, max_output_tokens=2048)
-        response = model.generate_content(
+    vertexai.init and GenerativeModel construction both do auth/discovery
+    work, so pay for them once instead of on every question. On a cold
+    cache the Vertex init and the schema fetch are independent network
+    round trips, so overlap them in a small thread pool.
+    """
+    from vertexai.generative_models import GenerativeModel
+
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        init_future = ex.submit(_init_vertex)
+        schema_future = ex.submit(_get_schema, base_source_id)
+        init_future.result()
+        schema_future.result()
+    system_prompt = SYSTEM_PROMPT_TEMPLATE.format(
+        source_name=SOURCE_NAMES.get(base_source_id, base_source_id),
+        schema=_get_schema(base_source_id),
+    )
+    return GenerativeModel(model_name=model_id, system_instruction=system_prompt)
+
+
+def run_agent_batch(questions: list, model_id: str, source_id: str,
+                    is_local: bool = False, max_workers: int = 10) -> list:
+    """
+    Run the agent over a batch of questions with concurrent Vertex AI calls.
+    Results are returned in the same order as `questions`.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        futures = {
+            ex.submit(run_agent, q, model_id, source_id, is_local): i
+            for i, q in enumerate(questions)
+        }
+        results = [None] * len(questions)
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    return results
+
+
+def _call_vertex_ai(question: str, model_id: str, base_source_id: str,
+                    on_sql=None) -> dict:
+    try:
+        from vertexai.generative_models import GenerationConfig
+
+        model = _get_model(model_id, base_source_id)
+        config = GenerationConfig(
+            temperature=0.1,
+            max_output_tokens=2048,
+            response_mime_type="application/json",
+            response_schema=RESPONSE_SCHEMA,
+        )
+        # Stream the response so the SQL field can be handed to the caller
+        # as soon as it closes, overlapping query execution with the rest
+        # of the generation instead of waiting for the final token.
+        chunks = []
+        sql_sent = False
+        for chunk in model.generate_content(
             f"Business question: {question}",
             generation_config=config,
-        )
+            stream=True,
+        ):
+            chunks.append(chunk.text)
+            if on_sql is not None and not sql_sent:
+                match = _SQL_FIELD_RE.search("".join(chunks))
+                if match:
+                    sql_sent = True
+                    on_sql(json.loads(f'"{match.group(1)}"'))
 
-        raw = response.text.strip()
-        raw = re.sub(r"^```(?:json)?\s*", "", raw)
-        raw = re.sub(r"\s*```$", "", raw)
-        return json.loads(raw)
+        return json.loads("".join(chunks))
 
     except Exception as e:
         return {
@@ -8,10 +8,8 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email import encoders
-from dotenv import load_dotenv
-
-load_dotenv()
 
+# app.py calls load_dotenv() before importing backend modules.
 DEMO_MODE = os.getenv("DEMO_MODE", "false").lower() == "true"
 SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com")
 SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
@@ -36,19 +36,18 @@ DEFAULT_MODEL_ID = "gemini-2.0-flash-001"
 MODEL_IDS = [m["id"] for m in AVAILABLE_MODELS]
 MODEL_LABELS = [m["label"] for m in AVAILABLE_MODELS]
 
+# Lookup tables built once at import — the accessors below run on every
+# re-render, so they should be O(1) dict gets rather than list scans.
+_MODEL_BY_ID = {m["id"]: m for m in AVAILABLE_MODELS}
+_MODEL_ID_BY_LABEL = {m["label"]: m["id"] for m in AVAILABLE_MODELS}
+
 
 def get_model_by_id(model_id: str) -> dict:
-    for m in AVAILABLE_MODELS:
-        if m["id"] == model_id:
-            return m
-    return AVAILABLE_MODELS[0]
+    return _MODEL_BY_ID.get(model_id, AVAILABLE_MODELS[0])
 
 
 def get_model_id_by_label(label: str) -> str:
-    for m in AVAILABLE_MODELS:
-        if m["label"] == label:
-            return m["id"]
-    return DEFAULT_MODEL_ID
+    return _MODEL_ID_BY_LABEL.get(label, DEFAULT_MODEL_ID)
 
 
 # ── Enterprise Data Sources ──────────────────────────────────────────────────
@@ -159,13 +158,17 @@ DATA_SOURCES = [
 SOURCE_IDS = [s["id"] for s in DATA_SOURCES]
 SOURCE_LABELS = [f'{s["icon"]} {s["label"]}' for s in DATA_SOURCES]
 
+# Indexed under both the "icon label" form the selectbox shows and the bare
+# label, so either spelling resolves in one lookup.
+_SOURCE_BY_LABEL = {}
+for _s in DATA_SOURCES:
+    _SOURCE_BY_LABEL[f'{_s["icon"]} {_s["label"]}'] = _s
+    _SOURCE_BY_LABEL.setdefault(_s["label"], _s)
+del _s
+
 
 def get_source_by_label(label: str) -> dict:
-    for s in DATA_SOURCES:
-        full = f'{s["icon"]} {s["label"]}'
-        if full == label or s["label"] == label:
-            return s
-    return DATA_SOURCES[0]
+    return _SOURCE_BY_LABEL.get(label, DATA_SOURCES[0])
 
 
 def is_local_source(source: dict) -> bool:
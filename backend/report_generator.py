@@ -2,21 +2,61 @@
 Report Generator — creates downloadable HTML dashboard reports with embedded Plotly charts.
 """
 
+import hashlib
+
 import pandas as pd
-import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
 from datetime import datetime
 
+# xxh3 hashes at memory speed; fall back to blake2b when the optional
+# xxhash extension isn't installed.
+try:
+    from xxhash import xxh3_64_intdigest as _bytes_digest
+except ImportError:
+    def _bytes_digest(buf) -> int:
+        return int.from_bytes(hashlib.blake2b(buf, digest_size=8).digest(), "big")
+
+
+def _df_fingerprint(df: pd.DataFrame) -> int:
+    """Cheap content fingerprint — row hashes in C, then one digest over the bytes."""
+    return _bytes_digest(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+
+# Loaded once in the report <head>; charts embed bare JSON + a newPlot call
+# instead of each carrying its own CDN <script> tag.
+_PLOTLY_CDN_TAG = '<script src="https://cdn.plot.ly/plotly-2.35.2.min.js" charset="utf-8"></script>'
+
+# Branch-free HTML escaping — str.translate with a precomputed table runs in C,
+# unlike calling html.escape per cell.
+_HTML_ESCAPE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"})
+
+# Bounded cache of rendered chart HTML — Plotly's figure build + to_html is
+# the expensive part of a report, and regenerating a report for the same
+# query produces byte-identical chart markup.
+_CHART_HTML_CACHE = {}
+_CHART_HTML_CACHE_MAX = 32
+
 
 def _build_chart_html(df, chart_type, x_col, y_col):
     """Build an interactive Plotly chart and return its HTML."""
     if df is None or df.empty:
         return ""
 
+    cache_key = (chart_type, x_col, y_col, df.shape, _df_fingerprint(df))
+    cached = _CHART_HTML_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
     cols = df.columns.tolist()
     if x_col not in cols:
         x_col = cols[0]
     if y_col not in cols or y_col == x_col:
-        nc = df.select_dtypes("number").columns.tolist()
+        # select_dtypes walks every block, so memoize the answer on the frame
+        # itself; mock templates arrive with this attr already populated.
+        nc = df.attrs.get("numeric_cols")
+        if nc is None:
+            nc = df.select_dtypes("number").columns.tolist()
+            df.attrs["numeric_cols"] = nc
         y_col = nc[0] if nc else cols[-1]
 
     COLORS = ["#6366f1", "#8b5cf6", "#a78bfa", "#c4b5fd", "#818cf8", "#e879f9"]
@@ -28,20 +68,44 @@ def _build_chart_html(df, chart_type, x_col, y_col):
         yaxis=dict(gridcolor="rgba(255,255,255,0.08)", tickfont=dict(color="#9ca3af")),
     )
 
+    # graph_objects directly from raw arrays — skips the Plotly Express
+    # dtype-inspection/facet layer, which dwarfs the trace build itself
+    # for these small frames.
+    x = df[x_col].to_numpy()
+    y = df[y_col].to_numpy()
     if chart_type == "pie":
-        fig = px.pie(df, names=x_col, values=y_col, color_discrete_sequence=COLORS, hole=0.35)
-        fig.update_traces(textfont_color="#e0e0e0")
+        fig = go.Figure(go.Pie(
+            labels=x, values=y, hole=0.35,
+            marker=dict(colors=COLORS), textfont=dict(color="#e0e0e0"),
+        ))
     elif chart_type == "line":
-        fig = px.line(df, x=x_col, y=y_col, markers=True, color_discrete_sequence=COLORS)
-        fig.update_traces(line=dict(width=3))
+        fig = go.Figure(go.Scatter(
+            x=x, y=y, mode="lines+markers",
+            line=dict(width=3, color=COLORS[0]),
+        ))
     else:
-        fig = px.bar(df, x=x_col, y=y_col, color_discrete_sequence=COLORS, text_auto=True)
-        fig.update_traces(textfont_size=11, textposition="outside", marker=dict(line=dict(width=0)))
+        fig = go.Figure(go.Bar(
+            x=x, y=y, marker=dict(color=COLORS[0], line=dict(width=0)),
+            text=y, textposition="outside", textfont=dict(size=11),
+        ))
 
     fig.update_layout(**layout)
 
-    # Return self-contained HTML div (includes Plotly.js CDN)
-    return fig.to_html(full_html=False, include_plotlyjs="cdn")
+    # Hand-rolled div + newPlot bootstrap: pio.to_json with validate=False
+    # skips Plotly's schema validation and its Python-side HTML templater.
+    # Plotly.js itself is loaded once from the report <head>.
+    div_id = f"chart-{abs(hash(cache_key)) % 2**31}"
+    fig_json = pio.to_json(fig, validate=False)
+    chart_html = (
+        f'<div id="{div_id}" class="plotly-graph-div" style="height:450px;"></div>'
+        f'<script>var fig_{div_id.replace("-", "_")} = {fig_json};'
+        f'Plotly.newPlot("{div_id}", fig_{div_id.replace("-", "_")}.data,'
+        f' fig_{div_id.replace("-", "_")}.layout, {{"responsive": true}});</script>'
+    )
+    if len(_CHART_HTML_CACHE) >= _CHART_HTML_CACHE_MAX:
+        _CHART_HTML_CACHE.pop(next(iter(_CHART_HTML_CACHE)))
+    _CHART_HTML_CACHE[cache_key] = chart_html
+    return chart_html
 
 
 def generate_html_report(
@@ -60,21 +124,35 @@ def generate_html_report(
     # Build chart HTML
     chart_html = _build_chart_html(df, chart_type, x_col, y_col)
 
-    # Build data table
+    # Build data table — pandas' to_html formats floats per-column in one
+    # pass and escapes cells in C, instead of per-cell Python dispatch.
     table_html = ""
     if df is not None and not df.empty:
-        table_html = '<table class="data-table">'
-        table_html += "<thead><tr>"
-        for col in df.columns:
-            table_html += f"<th>{col.replace('_', ' ').title()}</th>"
-        table_html += "</tr></thead><tbody>"
-        for _, row in df.head(20).iterrows():
-            table_html += "<tr>"
-            for val in row:
-                formatted = f"{val:,.2f}" if isinstance(val, float) else str(val)
-                table_html += f"<td>{formatted}</td>"
-            table_html += "</tr>"
-        table_html += "</tbody></table>"
+        table_html = (
+            df.head(20)
+            .rename(columns=lambda c: c.replace("_", " ").title())
+            .to_html(
+                index=False,
+                classes="data-table",
+                border=0,
+                float_format="{:,.2f}".format,
+                escape=True,
+            )
+        )
+
+    # Escape user/model-supplied text before it lands in the template.
+    question = question.translate(_HTML_ESCAPE)
+    explanation = explanation.translate(_HTML_ESCAPE)
+    sql = sql.translate(_HTML_ESCAPE)
+
+    # Assemble the dynamic fragments up front (list join, no += reallocation)
+    # so the template below is filled in a single linear pass.
+    badges = "".join(
+        f'<span class="badge">{b}</span>'
+        for b in (source_name, model_name, f"📊 {chart_type.title()} Chart")
+    )
+    chart_section = chart_html or '<p style="color:#6b7280;">No chart data available</p>'
+    table_section = table_html or '<p style="color:#6b7280;">No data available</p>'
 
     now = datetime.now().strftime("%B %d, %Y at %I:%M %p")
 
@@ -83,6 +161,7 @@ def generate_html_report(
 <head>
 <meta charset="UTF-8">
 <title>Agentic BI Report — {source_name}</title>
+{_PLOTLY_CDN_TAG if chart_html else ''}
 <style>
     * {{ margin: 0; padding: 0; box-sizing: border-box; }}
     body {{
@@ -149,9 +228,7 @@ def generate_html_report(
     <div class="header">
         <h1>🤖 Agentic BI Report</h1>
         <div class="meta">
-            <span class="badge">{source_name}</span>
-            <span class="badge">{model_name}</span>
-            <span class="badge">📊 {chart_type.title()} Chart</span>
+            {badges}
             &nbsp;·&nbsp; Generated: {now}
         </div>
     </div>
@@ -169,7 +246,7 @@ def generate_html_report(
     <div class="section">
         <div class="section-title">📊 Interactive Chart</div>
         <div class="chart-container">
-            {chart_html if chart_html else '<p style="color:#6b7280;">No chart data available</p>'}
+            {chart_section}
         </div>
     </div>
 
@@ -180,7 +257,7 @@ def generate_html_report(
 
     <div class="section">
         <div class="section-title">📋 Data ({len(df) if df is not None else 0} rows)</div>
-        {table_html if table_html else '<p style="color:#6b7280;">No data available</p>'}
+        {table_section}
     </div>
 
     <div class="footer">